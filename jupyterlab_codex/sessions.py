@@ -1,15 +1,23 @@
+import functools
 import json
 import os
 import re
 import threading
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 from uuid import uuid4
 
+try:
+    import orjson
+except ImportError:  # optional: only speeds up reading session files
+    orjson = None
+
 
 _TRUE_VALUES = {"1", "true", "y", "yes", "on"}
 _FALSE_VALUES = {"0", "false", "n", "no", "off"}
+_BOOL_VALUES = {**{value: True for value in _TRUE_VALUES}, **{value: False for value in _FALSE_VALUES}}
 _DEFAULT_SESSION_RETENTION_DAYS = 30
 _DEFAULT_SESSION_MAX_MESSAGES = 100
 _DEFAULT_SESSION_MAX_BYTES = 2_000_000
@@ -18,19 +26,83 @@ _DEFAULT_MAX_MESSAGE_CHARS = 12000
 _DEFAULT_UI_LABEL_MAX_CHARS = 80
 _DEFAULT_UI_PREVIEW_MAX_CHARS = 500
 _DEFAULT_UI_PREVIEW_MAX_ITEMS_PER_SESSION = 10
+_MESSAGE_CACHE_MAX_SESSIONS = 8
 _SESSION_FILE_VERSION = 1
-
-_SENSITIVE_PATTERNS = [
-    (
-        re.compile(
-            r"(?i)(\b(?:api[\-_ ]?key|authorization|bearer|access[\-_ ]?token|secret|password)\b\s*[:=]\s*)([\"']?)[^\s\"';,]+"
-        ),
-        r"\1\2[REDACTED]\2",
+_NOTEBOOK_MODES = frozenset({"ipynb", "jupytext_py", "plain_py"})
+# Checked in order: a path matching `.ipynb` on either side wins over `.py`.
+_NOTEBOOK_SUFFIX_MODES = ((".ipynb", "ipynb"), (".py", "plain_py"))
+_NOTEBOOK_SUFFIX_MAX_LEN = max(len(suffix) for suffix, _ in _NOTEBOOK_SUFFIX_MODES)
+
+
+# Keyword assignments and prefixed tokens are both anchored at a word start and cannot
+# overlap (tokens are single word runs whose prefixes differ from every keyword), so one
+# alternation behind a shared `\b` redacts them in a single scan. JWT-like tokens span
+# `.`/`-` boundaries and may end in a keyword, so they keep their own pass afterwards.
+# IGNORECASE keeps Unicode case folding, so e.g. "\u212a" (Kelvin sign) matches "k".
+_SENSITIVE_VALUES_RE = re.compile(
+    r"\b(?:"
+    r"(?P<assignment>(?:api[\-_ ]?key|authorization|bearer|access[\-_ ]?token|secret|password)\b\s*[:=]\s*)"
+    r"(?P<quote>[\"']?)[^\s\"';,]+"
+    r"|(?:gh[pousrl]|github_pat_)[A-Za-z0-9]{20,}\b"
+    r"|(?:sk|pk|xoxb|xoxp)_[A-Za-z0-9]+(?:_[A-Za-z0-9]+)?\b"
+    r")",
+    re.IGNORECASE,
+)
+_JWT_TOKEN_RE = re.compile(r"\beyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\b")
+# Lowercase substrings that every match of _SENSITIVE_VALUES_RE in ASCII text must contain;
+# ASCII text with none of them (most chat and notebook content) skips the regex scan.
+_SENSITIVE_ASSIGNMENT_HINTS = ("api", "authorization", "bearer", "access", "secret", "password")
+_SENSITIVE_TOKEN_HINTS = ("ghp", "gho", "ghu", "ghs", "ghr", "ghl", "github_pat_", "sk_", "pk_", "xoxb_", "xoxp_")
+
+# Fixed prompt fragments are joined once at import; build_prompt only splices in the
+# per-turn values and joins its blocks with "\n".
+_PROMPT_HEADER = (
+    "System: You are Codex running inside JupyterLab with file editing capabilities.\n"
+    "System: The user is working in a Jupyter notebook environment."
+)
+_PROMPT_PAIRED_RELOAD_NOTE = "\nSystem: The notebook will prompt reload when the paired file changes on disk."
+_PROMPT_PERMISSION_INSTRUCTION = (
+    "System: 4. If you cannot proceed due to sandbox/permission restrictions, say so explicitly and ask "
+    "the user to switch Permission (shield icon) to 'Full access' and retry. If authentication is "
+    "required, tell them to run `codex login` in a terminal first."
+)
+
+
+def _join_prompt_instructions(*lines: str) -> str:
+    return "\nSystem: Instructions:\n" + "\n".join(lines) + "\n"
+
+
+_PROMPT_INSTRUCTIONS: Dict[str, str] = {
+    "ipynb": _join_prompt_instructions(
+        "System: 1. For code changes, modify the paired file directly using file editing tools.",
+        "System: 2. Keep edits minimal and aligned with the user request.",
+        "System: 3. The 'Current Cell Content' shows what the user is currently viewing/editing.",
+        _PROMPT_PERMISSION_INSTRUCTION,
+    ),
+    "jupytext_py": _join_prompt_instructions(
+        "System: 1. For code changes, modify the current .py file directly using file editing tools.",
+        "System: 2. Preserve existing Jupytext structure and metadata (YAML header and # %% cell markers) unless the user asks to change them.",
+        "System: 3. The 'Current Cell Content' is a notebook cell snippet from the .py file.",
+        _PROMPT_PERMISSION_INSTRUCTION,
     ),
-    (re.compile(r"(?i)\b(?:gh[pousr]|ghr|ghs|ghl|ghu|github_pat_)[A-Za-z0-9]{20,}\b"), "[REDACTED_TOKEN]"),
-    (re.compile(r"(?i)\b(?:sk|pk|xoxb|xoxp)_[A-Za-z0-9]+(?:_[A-Za-z0-9]+)?\b"), "[REDACTED_TOKEN]"),
-    (re.compile(r"\beyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\b"), "[REDACTED_TOKEN]"),
-]
+    "plain_py": _join_prompt_instructions(
+        "System: 1. For code changes, modify the current .py file directly using file editing tools.",
+        "System: 2. Do not introduce Jupytext YAML headers or notebook cell markers (for example, # %%) unless the user explicitly requests it.",
+        "System: 3. If no context snippet is provided, inspect files directly before making edits.",
+        _PROMPT_PERMISSION_INSTRUCTION,
+    ),
+}
+_PROMPT_INSTRUCTIONS_FALLBACK = _join_prompt_instructions(
+    "System: 1. For code changes, inspect files directly and edit the correct target file.",
+    "System: 2. Keep edits minimal and aligned with the user request.",
+    "System: 3. The provided context snippet, if any, may be partial.",
+    _PROMPT_PERMISSION_INSTRUCTION,
+)
+_PROMPT_SELECTION_TRUNCATED_NOTE = (
+    "System: Current Cell Content was truncated before sending due size limits. "
+    "If full context is needed, inspect the source file directly.\n"
+)
+_PROMPT_CELL_OUTPUT_TRUNCATED_NOTE = "System: Current Cell Output was truncated before sending due size limits.\n"
 
 
 class SessionStore:
@@ -66,6 +138,10 @@ class SessionStore:
             )
         )
         self._last_global_prune = datetime.min.replace(tzinfo=timezone.utc)
+        # session_id -> ((mtime_ns, size) of the jsonl file, records), most recently used last.
+        self._message_cache: "OrderedDict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]]" = (
+            OrderedDict()
+        )
 
         if self._logging_enabled:
             self._base.mkdir(parents=True, exist_ok=True)
@@ -106,6 +182,24 @@ class SessionStore:
         if not session_id:
             return
 
+        self._append_records(session_id, [self._build_record(role, content, ui)])
+
+    def append_messages(self, session_id: str, role: str, contents: Iterable[str]) -> None:
+        """Append several messages with one write and one limit check instead of one per message."""
+        if not self._logging_enabled:
+            return
+        if not session_id:
+            return
+
+        records: Iterable[Dict[str, Any]] = (self._build_record(role, content) for content in contents)
+        if self._max_messages_per_session > 0:
+            # Older entries would be trimmed right after the write, so keep only the tail.
+            records = deque(records, maxlen=self._max_messages_per_session)
+        records = list(records)
+        if records:
+            self._append_records(session_id, records)
+
+    def _build_record(self, role: str, content: str, ui: Dict[str, Any] | None = None) -> Dict[str, Any]:
         normalized_role = role if role in {"system", "user", "assistant"} else "system"
         record = {
             "role": normalized_role,
@@ -115,16 +209,22 @@ class SessionStore:
         ui_payload = _sanitize_ui_payload(ui)
         if ui_payload:
             record["ui"] = ui_payload
+        return record
 
+    def _append_records(self, session_id: str, records: List[Dict[str, Any]]) -> None:
         with self._file_lock:
             path = self._jsonl_path(session_id)
+            cached_valid = self._cached_messages_locked(session_id, path) is not None
             try:
                 with path.open("a", encoding="utf-8") as handle:
-                    handle.write(json.dumps(record))
-                    handle.write("\n")
+                    handle.write("".join(f"{json.dumps(record)}\n" for record in records))
             except OSError:
+                self._invalidate_message_cache_locked(session_id)
                 return
 
+            if cached_valid:
+                self._append_cached_messages_locked(session_id, path, records)
+
             self._touch_meta_locked(session_id)
             self._enforce_session_limits_locked(session_id)
             if self._is_global_prune_due():
@@ -140,23 +240,52 @@ class SessionStore:
         if not path.exists():
             return []
 
-        messages: List[Dict[str, Any]] = []
         with self._file_lock:
-            try:
-                with path.open("r", encoding="utf-8") as handle:
-                    for line in handle:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        try:
-                            payload = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-                        if isinstance(payload, dict):
-                            messages.append(payload)
-            except OSError:
-                return []
-        return messages
+            cached = self._cached_messages_locked(session_id, path)
+            if cached is not None:
+                return list(cached)
+
+            signature = _file_signature(path)
+            messages, _ = _read_jsonl_records(path)
+            if signature is not None:
+                self._store_message_cache_locked(session_id, signature, messages)
+        return list(messages)
+
+    def _cached_messages_locked(self, session_id: str, path: Path) -> List[Dict[str, Any]] | None:
+        entry = self._message_cache.get(session_id)
+        if entry is None:
+            return None
+        cached_signature, records = entry
+        # The file can still be changed by another store instance or process, so a
+        # cached history is only trusted while the file on disk is unchanged.
+        if _file_signature(path) != cached_signature:
+            self._message_cache.pop(session_id, None)
+            return None
+        self._message_cache.move_to_end(session_id)
+        return records
+
+    def _store_message_cache_locked(
+        self, session_id: str, signature: Tuple[int, int], records: List[Dict[str, Any]]
+    ) -> None:
+        self._message_cache[session_id] = (signature, records)
+        self._message_cache.move_to_end(session_id)
+        while len(self._message_cache) > _MESSAGE_CACHE_MAX_SESSIONS:
+            self._message_cache.popitem(last=False)
+
+    def _append_cached_messages_locked(
+        self, session_id: str, path: Path, new_records: List[Dict[str, Any]]
+    ) -> None:
+        entry = self._message_cache.get(session_id)
+        signature = _file_signature(path)
+        if entry is None or signature is None:
+            self._invalidate_message_cache_locked(session_id)
+            return
+        records = entry[1]
+        records.extend(new_records)
+        self._store_message_cache_locked(session_id, signature, records)
+
+    def _invalidate_message_cache_locked(self, session_id: str) -> None:
+        self._message_cache.pop(session_id, None)
 
     def _prune_user_ui_previews(self, session_id: str, keep_latest: int) -> None:
         if keep_latest <= 0:
@@ -187,115 +316,69 @@ class SessionStore:
         if not paired_path and not paired_os_path:
             paired_path, paired_os_path = _derive_paired_paths(notebook_path, notebook_os_path)
 
-        parts = [
-            "System: You are Codex running inside JupyterLab with file editing capabilities.",
-            "System: The user is working in a Jupyter notebook environment.",
-        ]
+        parts = [_PROMPT_HEADER]
 
         if notebook_path:
-            parts.append(f"System: Current notebook (Jupyter path): {notebook_path}")
+            parts.append("System: Current notebook (Jupyter path): " + notebook_path)
         if notebook_os_path:
-            parts.append(f"System: Current notebook (absolute path): {notebook_os_path}")
+            parts.append("System: Current notebook (absolute path): " + notebook_os_path)
         if cwd:
-            parts.append(f"System: Current working directory: {cwd}")
+            parts.append("System: Current working directory: " + cwd)
 
         if mode == "ipynb" and paired_os_path:
-            parts.extend(
-                [
-                    f"System: Jupytext paired file (absolute path): {paired_os_path}",
-                    f"System: IMPORTANT - Edit this file directly: {paired_os_path}",
-                    "System: The notebook will prompt reload when the paired file changes on disk.",
-                ]
+            parts.append(
+                "System: Jupytext paired file (absolute path): "
+                + paired_os_path
+                + "\nSystem: IMPORTANT - Edit this file directly: "
+                + paired_os_path
+                + _PROMPT_PAIRED_RELOAD_NOTE
             )
         elif mode == "ipynb" and paired_path:
-            parts.extend(
-                [
-                    f"System: Jupytext paired file (Jupyter path): {paired_path}",
-                    f"System: IMPORTANT - Edit this file directly: {paired_path}",
-                    "System: The notebook will prompt reload when the paired file changes on disk.",
-                ]
+            parts.append(
+                "System: Jupytext paired file (Jupyter path): "
+                + paired_path
+                + "\nSystem: IMPORTANT - Edit this file directly: "
+                + paired_path
+                + _PROMPT_PAIRED_RELOAD_NOTE
             )
         elif mode == "jupytext_py":
-            target = notebook_os_path or notebook_path or "<notebook>.py"
-            parts.extend(
-                [
-                    "System: Current file mode: Jupytext Python notebook script (.py).",
-                    f"System: IMPORTANT - Edit this file directly: {target}",
-                ]
+            parts.append(
+                "System: Current file mode: Jupytext Python notebook script (.py)."
+                "\nSystem: IMPORTANT - Edit this file directly: "
+                + (notebook_os_path or notebook_path or "<notebook>.py")
             )
         elif mode == "plain_py":
-            target = notebook_os_path or notebook_path or "<script>.py"
-            parts.extend(
-                [
-                    "System: Current file mode: Plain Python script (.py).",
-                    f"System: IMPORTANT - Edit this file directly: {target}",
-                ]
+            parts.append(
+                "System: Current file mode: Plain Python script (.py)."
+                "\nSystem: IMPORTANT - Edit this file directly: "
+                + (notebook_os_path or notebook_path or "<script>.py")
             )
 
-        if mode == "ipynb":
-            instructions = [
-                "System: 1. For code changes, modify the paired file directly using file editing tools.",
-                "System: 2. Keep edits minimal and aligned with the user request.",
-                "System: 3. The 'Current Cell Content' shows what the user is currently viewing/editing.",
-                "System: 4. If you cannot proceed due to sandbox/permission restrictions, say so explicitly and ask the user to switch Permission (shield icon) to 'Full access' and retry. If authentication is required, tell them to run `codex login` in a terminal first.",
-            ]
-        elif mode == "jupytext_py":
-            instructions = [
-                "System: 1. For code changes, modify the current .py file directly using file editing tools.",
-                "System: 2. Preserve existing Jupytext structure and metadata (YAML header and # %% cell markers) unless the user asks to change them.",
-                "System: 3. The 'Current Cell Content' is a notebook cell snippet from the .py file.",
-                "System: 4. If you cannot proceed due to sandbox/permission restrictions, say so explicitly and ask the user to switch Permission (shield icon) to 'Full access' and retry. If authentication is required, tell them to run `codex login` in a terminal first.",
-            ]
-        elif mode == "plain_py":
-            instructions = [
-                "System: 1. For code changes, modify the current .py file directly using file editing tools.",
-                "System: 2. Do not introduce Jupytext YAML headers or notebook cell markers (for example, # %%) unless the user explicitly requests it.",
-                "System: 3. If no context snippet is provided, inspect files directly before making edits.",
-                "System: 4. If you cannot proceed due to sandbox/permission restrictions, say so explicitly and ask the user to switch Permission (shield icon) to 'Full access' and retry. If authentication is required, tell them to run `codex login` in a terminal first.",
-            ]
-        else:
-            instructions = [
-                "System: 1. For code changes, inspect files directly and edit the correct target file.",
-                "System: 2. Keep edits minimal and aligned with the user request.",
-                "System: 3. The provided context snippet, if any, may be partial.",
-                "System: 4. If you cannot proceed due to sandbox/permission restrictions, say so explicitly and ask the user to switch Permission (shield icon) to 'Full access' and retry. If authentication is required, tell them to run `codex login` in a terminal first.",
-            ]
-
-        parts.extend(["", "System: Instructions:", *instructions, ""])
+        parts.append(_PROMPT_INSTRUCTIONS.get(mode, _PROMPT_INSTRUCTIONS_FALLBACK))
 
         if include_history and messages:
-            parts.append("Conversation:")
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                parts.append(f"{role.title()}: {content}")
-            parts.append("")
+            parts.append(
+                "Conversation:\n"
+                + "\n".join(
+                    f"{msg.get('role', 'user').title()}: {msg.get('content', '')}" for msg in messages
+                )
+                + "\n"
+            )
 
         include_selection = mode in {"ipynb", "jupytext_py", "plain_py"}
         include_cell_output = mode in {"ipynb", "jupytext_py"}
 
         if include_selection and selection:
-            parts.append("Current Cell Content:")
-            parts.append(selection)
-            parts.append("")
+            parts.append("Current Cell Content:\n" + selection + "\n")
         if include_selection and selection_truncated:
-            parts.append(
-                "System: Current Cell Content was truncated before sending due size limits. If full context is needed, inspect the source file directly."
-            )
-            parts.append("")
+            parts.append(_PROMPT_SELECTION_TRUNCATED_NOTE)
 
         if include_cell_output and cell_output:
-            parts.append("Current Cell Output:")
-            parts.append(cell_output)
-            parts.append("")
+            parts.append("Current Cell Output:\n" + cell_output + "\n")
         if include_cell_output and cell_output_truncated:
-            parts.append(
-                "System: Current Cell Output was truncated before sending due size limits."
-            )
-            parts.append("")
+            parts.append(_PROMPT_CELL_OUTPUT_TRUNCATED_NOTE)
 
-        parts.append("User:")
-        parts.append(user_content)
+        parts.append("User:\n" + user_content)
 
         return "\n".join(parts)
 
@@ -459,6 +542,8 @@ class SessionStore:
             return new_id
 
         with self._file_lock:
+            self._invalidate_message_cache_locked(old_id)
+            self._invalidate_message_cache_locked(new_id)
             old_jsonl = self._jsonl_path(old_id)
             new_jsonl = self._jsonl_path(new_id)
             if old_jsonl.exists():
@@ -643,16 +728,17 @@ class SessionStore:
         if not records and invalid_count == 0:
             return
 
-        original_records = list(records)
+        # Only the record count is compared below, so there is no need to copy the list.
+        original_count = len(records)
 
-        if self._max_messages_per_session > 0:
-            records = records[-self._max_messages_per_session :]
+        if self._max_messages_per_session > 0 and original_count > self._max_messages_per_session:
+            del records[: original_count - self._max_messages_per_session]
 
         self._trim_user_ui_previews(records, _DEFAULT_UI_PREVIEW_MAX_ITEMS_PER_SESSION)
         if self._max_session_bytes > 0:
             self._trim_records_to_byte_budget(records, self._max_session_bytes)
 
-        changed = (len(records) != len(original_records)) or (invalid_count > 0) or should_check_size
+        changed = (len(records) != original_count) or (invalid_count > 0) or should_check_size
         if not changed:
             return
 
@@ -696,10 +782,13 @@ class SessionStore:
         if total_bytes <= max_bytes:
             return
 
-        while total_bytes > max_bytes and records:
-            removed = serialized_sizes.pop(0) + 1
-            records.pop(0)
-            total_bytes -= removed
+        # Find how many of the oldest records must go, then drop them in one slice
+        # deletion instead of shifting the whole list once per pop(0).
+        drop = 0
+        while total_bytes > max_bytes and drop < len(records):
+            total_bytes -= serialized_sizes[drop] + 1
+            drop += 1
+        del records[:drop]
 
     def _trim_user_ui_previews(self, records: List[Dict[str, Any]], keep_latest: int) -> None:
         if keep_latest <= 0:
@@ -724,6 +813,7 @@ class SessionStore:
                 records[idx].pop("ui", None)
 
     def _write_jsonl_records(self, path: Path, records: List[Dict[str, Any]]) -> bool:
+        session_id = path.stem
         tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
         try:
             with tmp_path.open("w", encoding="utf-8") as handle:
@@ -731,10 +821,18 @@ class SessionStore:
                     handle.write(json.dumps(record))
                     handle.write("\n")
             tmp_path.replace(path)
-            return True
         except OSError:
+            self._invalidate_message_cache_locked(session_id)
             return False
 
+        # The rewritten file holds exactly `records`, so keep a warm cache entry warm.
+        signature = _file_signature(path)
+        if session_id in self._message_cache and signature is not None:
+            self._store_message_cache_locked(session_id, signature, list(records))
+        else:
+            self._invalidate_message_cache_locked(session_id)
+        return True
+
     def _write_meta_atomic(self, path: Path, meta: Dict[str, Any]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
@@ -742,6 +840,7 @@ class SessionStore:
         tmp_path.replace(path)
 
     def _delete_session_files(self, session_id: str) -> bool:
+        self._invalidate_message_cache_locked(session_id)
         deleted_any = False
         failed = False
         for path in (self._jsonl_path(session_id), self._meta_path(session_id)):
@@ -755,39 +854,50 @@ class SessionStore:
         return deleted_any and not failed
 
 
+# The same notebook paths are resolved on every session touch and prompt; both helpers are
+# pure functions of their string arguments.
+@functools.lru_cache(maxsize=2048)
 def _derive_paired_paths(notebook_path: str, notebook_os_path: str) -> Tuple[str, str]:
-    paired_path = ""
-    paired_os_path = ""
-
-    notebook_path_lower = (notebook_path or "").lower()
-    notebook_os_path_lower = (notebook_os_path or "").lower()
+    return _paired_path(notebook_path or ""), _paired_path(notebook_os_path or "")
 
-    if notebook_path_lower.endswith(".ipynb"):
-        paired_path = notebook_path[:-6] + ".py"
-    elif notebook_path_lower.endswith(".py"):
-        paired_path = notebook_path[:-3] + ".ipynb"
-    if notebook_os_path_lower.endswith(".ipynb"):
-        paired_os_path = notebook_os_path[:-6] + ".py"
-    elif notebook_os_path_lower.endswith(".py"):
-        paired_os_path = notebook_os_path[:-3] + ".ipynb"
 
-    return paired_path, paired_os_path
+def _paired_path(path: str) -> str:
+    # Split on the last dot and lowercase only the extension instead of the whole path.
+    stem, dot, extension = path.rpartition(".")
+    if not dot:
+        return ""
+    extension = extension.lower()
+    if extension == "ipynb":
+        return stem + ".py"
+    if extension == "py":
+        return stem + ".ipynb"
+    return ""
 
 
+@functools.lru_cache(maxsize=2048)
 def _normalize_notebook_mode(raw_mode: str, notebook_path: str, notebook_os_path: str) -> str:
     mode = (raw_mode or "").strip().lower()
-    if mode in {"ipynb", "jupytext_py", "plain_py"}:
+    if mode in _NOTEBOOK_MODES:
         return mode
 
-    path = (notebook_path or "").strip().lower()
-    os_path = (notebook_os_path or "").strip().lower()
-    if path.endswith(".ipynb") or os_path.endswith(".ipynb"):
-        return "ipynb"
-    if path.endswith(".py") or os_path.endswith(".py"):
-        return "plain_py"
+    # Only the suffix matters, so lowercase just the last few characters rather than
+    # a copy of each full path.
+    path_tail = (notebook_path or "").rstrip()[-_NOTEBOOK_SUFFIX_MAX_LEN:].lower()
+    os_path_tail = (notebook_os_path or "").rstrip()[-_NOTEBOOK_SUFFIX_MAX_LEN:].lower()
+    for suffix, suffix_mode in _NOTEBOOK_SUFFIX_MODES:
+        if path_tail.endswith(suffix) or os_path_tail.endswith(suffix):
+            return suffix_mode
     return "unsupported"
 
 
+def _file_signature(path: Path) -> Tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -795,32 +905,31 @@ def _now_iso() -> str:
 def _as_bool(raw_value: str | None, default: bool) -> bool:
     if raw_value is None:
         return default
-    value = raw_value.strip().lower()
-    if value in _TRUE_VALUES:
-        return True
-    if value in _FALSE_VALUES:
-        return False
-    return default
+    # Env values are usually already normalized ("1", "false"), so try them as-is first.
+    parsed = _BOOL_VALUES.get(raw_value)
+    if parsed is None:
+        parsed = _BOOL_VALUES.get(raw_value.strip().lower(), default)
+    return parsed
 
 
 def _as_positive_int(raw_value: str | None, default: int) -> int:
-    if raw_value is None:
-        return default
-    try:
-        parsed = int(raw_value)
-    except ValueError:
-        return default
-    return parsed if parsed > 0 else default
+    parsed = _parse_int(raw_value)
+    return parsed if parsed is not None and parsed > 0 else default
 
 
 def _as_non_negative_int(raw_value: str | None, default: int) -> int:
+    parsed = _parse_int(raw_value)
+    return parsed if parsed is not None and parsed >= 0 else default
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_int(raw_value: str | None) -> int | None:
     if raw_value is None:
-        return default
+        return None
     try:
-        parsed = int(raw_value)
+        return int(raw_value)
     except ValueError:
-        return default
-    return parsed if parsed >= 0 else default
+        return None
 
 
 def _parse_iso_datetime(raw_value: str | None) -> datetime | None:
@@ -865,11 +974,12 @@ def _sanitize_ui_preview(raw: Any) -> Dict[str, str]:
     if not isinstance(location_raw, str) or not isinstance(preview_text_raw, str):
         return {}
 
-    location = _sanitize_message(location_raw.strip(), _DEFAULT_UI_LABEL_MAX_CHARS)
-    preview_text = _sanitize_message(
-        preview_text_raw.replace("\r\n", "\n").replace("\r", "\n").strip(),
-        _DEFAULT_UI_PREVIEW_MAX_CHARS,
-    )
+    location = _truncate_ui_label(_sanitize_sensitive_values(location_raw.strip()))
+    # One scan for the common case of text without carriage returns; CRLF must stay a
+    # single newline, so the two-step replace is kept for text that has them.
+    if "\r" in preview_text_raw:
+        preview_text_raw = preview_text_raw.replace("\r\n", "\n").replace("\r", "\n")
+    preview_text = _truncate_ui_preview(_sanitize_sensitive_values(preview_text_raw.strip()))
     if not location or not preview_text:
         return {}
 
@@ -878,11 +988,32 @@ def _sanitize_ui_preview(raw: Any) -> Dict[str, str]:
 
 def _sanitize_sensitive_values(raw: str) -> str:
     sanitized = raw
-    for pattern, replacement in _SENSITIVE_PATTERNS:
-        sanitized = pattern.sub(replacement, sanitized)
+    if _may_contain_sensitive_values(raw):
+        sanitized = _SENSITIVE_VALUES_RE.sub(_redact_sensitive_match, sanitized)
+    if "eyJ" in sanitized:
+        sanitized = _JWT_TOKEN_RE.sub("[REDACTED_TOKEN]", sanitized)
     return sanitized
 
 
+def _may_contain_sensitive_values(raw: str) -> bool:
+    if not raw.isascii():
+        # IGNORECASE folds letters such as "\u212a", "\u017f" and "\u0130" onto ASCII ones,
+        # which a lowercase substring check cannot see; let the regex decide.
+        return True
+    lowered = raw.lower()
+    if ("=" in raw or ":" in raw) and any(hint in lowered for hint in _SENSITIVE_ASSIGNMENT_HINTS):
+        return True
+    return any(hint in lowered for hint in _SENSITIVE_TOKEN_HINTS)
+
+
+def _redact_sensitive_match(match: "re.Match[str]") -> str:
+    assignment = match.group("assignment")
+    if assignment is None:
+        return "[REDACTED_TOKEN]"
+    quote = match.group("quote")
+    return assignment + quote + "[REDACTED]" + quote
+
+
 def _truncate_text(raw: str, max_chars: int) -> str:
     if not raw:
         return raw
@@ -892,7 +1023,25 @@ def _truncate_text(raw: str, max_chars: int) -> str:
         return raw
     if max_chars <= 3:
         return raw[:max_chars]
-    return f"{raw[: max_chars - 3]}..."
+    return raw[: max_chars - 3] + "..."
+
+
+# _truncate_text specialised to the fixed UI limits (both well above 3), so the per-preview
+# calls skip its guards.
+_UI_LABEL_TRUNCATE_AT = _DEFAULT_UI_LABEL_MAX_CHARS - 3
+_UI_PREVIEW_TRUNCATE_AT = _DEFAULT_UI_PREVIEW_MAX_CHARS - 3
+
+
+def _truncate_ui_label(raw: str) -> str:
+    if len(raw) <= _DEFAULT_UI_LABEL_MAX_CHARS:
+        return raw
+    return raw[:_UI_LABEL_TRUNCATE_AT] + "..."
+
+
+def _truncate_ui_preview(raw: str) -> str:
+    if len(raw) <= _DEFAULT_UI_PREVIEW_MAX_CHARS:
+        return raw
+    return raw[:_UI_PREVIEW_TRUNCATE_AT] + "..."
 
 
 def _read_jsonl_records(path: Path) -> Tuple[List[Dict[str, Any]], int]:
@@ -900,15 +1049,15 @@ def _read_jsonl_records(path: Path) -> Tuple[List[Dict[str, Any]], int]:
     removed_invalid_count = 0
 
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
+        with path.open("rb") as handle:
+            for raw_line in handle:
+                # The parsers skip surrounding whitespace themselves, so blank lines are only
+                # told apart from corrupt ones on the (rare) failure path.
                 try:
-                    payload = json.loads(line)
-                except json.JSONDecodeError:
-                    removed_invalid_count += 1
+                    payload = _loads_jsonl_line(raw_line)
+                except ValueError:
+                    if not raw_line.isspace():
+                        removed_invalid_count += 1
                     continue
                 if isinstance(payload, dict):
                     records.append(payload)
@@ -918,3 +1067,14 @@ def _read_jsonl_records(path: Path) -> Tuple[List[Dict[str, Any]], int]:
         return [], 1
 
     return records, removed_invalid_count
+
+
+def _loads_jsonl_line(raw_line: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw_line)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the json.dumps output we write (lone surrogates,
+            # NaN), so fall back before treating the line as corrupt.
+            pass
+    return json.loads(raw_line.decode("utf-8"))
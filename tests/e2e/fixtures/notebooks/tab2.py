@@ -16,6 +16,11 @@
 # %%
 import numpy as np
 
+try:
+    from scipy.fft import fft, ifft
+except ImportError:  # scipy is optional; NumPy's pocketfft gives the same results
+    from numpy.fft import fft, ifft
+
 
 def simulate_schrodinger_1d(
     n_grid: int = 1024,
@@ -31,6 +36,8 @@ def simulate_schrodinger_1d(
     x0: float = -7.0,
     sigma: float = 1.0,
     k0: float = 2.0,
+    renormalize_every: int = 100,
+    dtype: type[np.complexfloating] = np.complex128,
 ) -> dict[str, object]:
     """
     Simulate a 1D wave packet under the time-dependent Schrodinger equation
@@ -50,6 +57,14 @@ def simulate_schrodinger_1d(
         raise ValueError("save_every must be an int >= 1")
     if sigma <= 0:
         raise ValueError("sigma must be > 0")
+    if (
+        not isinstance(renormalize_every, int)
+        or isinstance(renormalize_every, bool)
+        or renormalize_every < 1
+    ):
+        raise ValueError("renormalize_every must be an int >= 1")
+    if np.dtype(dtype) not in (np.complex64, np.complex128):
+        raise ValueError("dtype must be complex64 or complex128")
 
     x = np.linspace(x_min, x_max, n_grid, endpoint=False)
     dx = x[1] - x[0]
@@ -57,7 +72,8 @@ def simulate_schrodinger_1d(
     if potential_type == "harmonic":
         if omega < 0:
             raise ValueError("omega must be >= 0")
-        potential = 0.5 * (omega**2) * (x**2)
+        potential = np.multiply(x, x)
+        potential *= 0.5 * omega * omega
     elif potential_type == "barrier":
         if barrier_width < 0:
             raise ValueError("barrier_width must be >= 0")
@@ -65,49 +81,72 @@ def simulate_schrodinger_1d(
     else:
         raise ValueError("potential_type must be 'harmonic' or 'barrier'")
 
-    psi = np.exp(-((x - x0) ** 2) / (2.0 * sigma**2)) * np.exp(1j * k0 * x)
+    psi = (np.exp(-((x - x0) ** 2) / (2.0 * sigma**2)) * np.exp(1j * k0 * x)).astype(dtype)
 
-    def norm(wavefunc: np.ndarray) -> float:
-        return float(np.sum(np.abs(wavefunc) ** 2) * dx)
+    def probability_density(wavefunc: np.ndarray, out: np.ndarray) -> np.ndarray:
+        np.abs(wavefunc, out=out)
+        return np.multiply(out, out, out=out)
 
-    def expected_x(wavefunc: np.ndarray) -> float:
-        density = np.abs(wavefunc) ** 2
-        return float(np.sum(x * density) * dx)
+    def norm(density: np.ndarray) -> float:
+        return float(np.sum(density) * dx)
 
-    def total_energy(wavefunc: np.ndarray) -> float:
-        grad = np.gradient(wavefunc, dx)
-        kinetic = 0.5 * np.sum(np.abs(grad) ** 2) * dx
-        potential_energy = np.sum(potential * (np.abs(wavefunc) ** 2)) * dx
-        return float(np.real(kinetic + potential_energy))
+    def expected_x(density: np.ndarray) -> float:
+        return float(np.dot(x, density) * dx)
 
-    psi /= np.sqrt(norm(psi))
+    def total_energy(wavefunc: np.ndarray, density: np.ndarray) -> float:
+        grad = np.gradient(wavefunc, dx)
+        kinetic = 0.5 * np.vdot(grad, grad).real * dx
+        potential_energy = np.dot(potential, density) * dx
+        return float(kinetic + potential_energy)
+
+    # |psi|^2 is computed once per step into this buffer and shared by all observables.
+    density = np.empty(n_grid)
+    psi /= np.sqrt(norm(probability_density(psi, density)))
+    probability_density(psi, density)
     k = 2.0 * np.pi * np.fft.fftfreq(n_grid, d=dx)
-    kinetic_phase = np.exp(-0.5j * (k**2) * dt)
-    potential_half_phase = np.exp(-0.5j * potential * dt)
-
-    snapshots: list[tuple[float, np.ndarray]] = [(0.0, np.abs(psi) ** 2)]
-    norm_history = [norm(psi)]
-    x_expect_history = [expected_x(psi)]
-    energy_history = [total_energy(psi)]
+    k_squared = k * k
+    # complex64 halves the bytes moved by the FFTs and phase multiplies.
+    kinetic_phase = np.exp((-0.5j * dt) * k_squared).astype(dtype, copy=False)
+    potential_half_phase = np.exp((-0.5j * dt) * potential).astype(dtype, copy=False)
+
+    # Histories and snapshots are preallocated and filled by index.
+    n_snapshots = steps // save_every + 1 + (1 if steps % save_every else 0)
+    snapshot_times = np.empty(n_snapshots)
+    snapshots = np.empty((n_snapshots, n_grid))
+    norm_history = np.empty(steps + 1)
+    x_expect_history = np.empty(steps + 1)
+    # Energy only feeds the drift check, so it is sampled with the snapshots rather than
+    # every step; energy_history[i] belongs to snapshot_times[i].
+    energy_history = np.empty(n_snapshots)
+
+    snapshot_times[0] = 0.0
+    snapshots[0] = density
+    snapshot_index = 1
+    norm_history[0] = norm(density)
+    x_expect_history[0] = expected_x(density)
+    energy_history[0] = total_energy(psi, density)
 
     for step in range(1, steps + 1):
-        psi = potential_half_phase * psi
-        psi_k = np.fft.fft(psi)
-        psi_k = kinetic_phase * psi_k
-        psi = np.fft.ifft(psi_k)
-        psi = potential_half_phase * psi
-        psi /= np.sqrt(norm(psi))
-
-        current_norm = norm(psi)
-        norm_history.append(current_norm)
-        x_expect_history.append(expected_x(psi))
-        energy_history.append(total_energy(psi))
-
-        if step % save_every == 0:
-            snapshots.append((step * dt, np.abs(psi) ** 2))
-
-    if steps % save_every != 0:
-        snapshots.append((steps * dt, np.abs(psi) ** 2))
+        psi *= potential_half_phase
+        psi_k = fft(psi)
+        psi_k *= kinetic_phase
+        psi = ifft(psi_k)
+        psi *= potential_half_phase
+        probability_density(psi, density)
+        # The split-operator step is unitary; only occasionally undo rounding drift.
+        if step % renormalize_every == 0:
+            step_norm = norm(density)
+            psi /= np.sqrt(step_norm)
+            density /= step_norm
+
+        norm_history[step] = norm(density)
+        x_expect_history[step] = expected_x(density)
+
+        if step % save_every == 0 or step == steps:
+            snapshot_times[snapshot_index] = step * dt
+            snapshots[snapshot_index] = density
+            energy_history[snapshot_index] = total_energy(psi, density)
+            snapshot_index += 1
 
     return {
         "x": x,
@@ -116,11 +155,12 @@ def simulate_schrodinger_1d(
         "dx": dx,
         "dt": dt,
         "steps": steps,
+        "snapshot_times": snapshot_times,
         "snapshots": snapshots,
-        "final_norm": norm(psi),
-        "norm_history": np.array(norm_history),
-        "x_expect_history": np.array(x_expect_history),
-        "energy_history": np.array(energy_history),
+        "final_norm": norm(density),
+        "norm_history": norm_history,
+        "x_expect_history": x_expect_history,
+        "energy_history": energy_history,
     }
 
 
@@ -151,8 +191,10 @@ def transmission_reflection_probabilities(
     psi = np.asarray(result["psi"], dtype=np.complex128)
     dx = float(result["dx"])
     density = np.abs(psi) ** 2
-    reflection = float(np.sum(density[x < split_x]) * dx)
-    transmission = float(np.sum(density[x >= split_x]) * dx)
+    # x is a sorted grid, so x < split_x is a prefix; slice it instead of masking.
+    split_index = np.searchsorted(x, split_x, side="left")
+    reflection = float(np.sum(density[:split_index]) * dx)
+    transmission = float(np.sum(density[split_index:]) * dx)
     return transmission, reflection
 
 
@@ -161,9 +203,10 @@ def plot_simulation(result: dict[str, object]) -> None:
 
     x = np.asarray(result["x"])
     potential = np.asarray(result["V"])
-    snapshots = result["snapshots"]
+    snapshot_times = np.asarray(result["snapshot_times"])
+    snapshots = np.asarray(result["snapshots"])
 
-    max_density = max(float(np.max(density)) for _, density in snapshots)
+    max_density = float(np.max(snapshots))
     shifted = potential - float(np.min(potential))
     vmax = float(np.max(shifted))
     if vmax > 0:
@@ -173,7 +216,7 @@ def plot_simulation(result: dict[str, object]) -> None:
 
     plt.figure(figsize=(10, 5))
     plt.plot(x, scaled_potential, "k--", linewidth=1.2, label="Scaled potential")
-    for time_point, density in snapshots:
+    for time_point, density in zip(snapshot_times, snapshots):
         plt.plot(x, density, label=f"t = {time_point:.2f}")
     plt.title("1D Time-Dependent Schrodinger Simulation")
     plt.xlabel("x")
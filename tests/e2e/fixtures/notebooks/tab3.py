@@ -17,22 +17,58 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+try:
+    # scipy.fft keeps pocketfft plans cached across calls of the same size.
+    from scipy.fft import fft, ifft
+except ImportError:  # scipy is optional; NumPy's pocketfft gives the same results
+
+    def fft(x, overwrite_x=False):
+        return np.fft.fft(x)
+
+    def ifft(x, overwrite_x=False):
+        return np.fft.ifft(x)
+
 # %%
 # 1D time-dependent Schrodinger equation simulation (hbar = m = 1).
 # Method: split-operator (FFT), which keeps time evolution numerically stable.
 
-def split_operator_step(psi_state, phase_v_half, phase_t):
-    # One split-operator update: V/2 -> T -> V/2
-    psi_state = phase_v_half * psi_state
-    psi_k_state = np.fft.fft(psi_state)
+def split_operator_steps(psi_state, phase_v_half, phase_v_full, phase_t, n_steps):
+    # n_steps split-operator updates (V/2 -> T -> V/2 each). The trailing V/2 of one
+    # step and the leading V/2 of the next are fused into a single full V kick.
+    # psi_state is updated in place; with scipy.fft the transforms reuse its buffer too.
+    # The last kinetic step is peeled off so the loop body stays branch-free.
+    psi_state *= phase_v_half
+    for _ in range(n_steps - 1):
+        psi_k_state = fft(psi_state, overwrite_x=True)
+        psi_k_state *= phase_t
+        psi_state = ifft(psi_k_state, overwrite_x=True)
+        psi_state *= phase_v_full
+    psi_k_state = fft(psi_state, overwrite_x=True)
     psi_k_state *= phase_t
-    psi_state = np.fft.ifft(psi_k_state)
-    psi_state = phase_v_half * psi_state
+    psi_state = ifft(psi_k_state, overwrite_x=True)
+    psi_state *= phase_v_half
     return psi_state
 
 
 # %%
 # Simulation helpers
+def _density(psi, out=None):
+    # |psi|^2 without the per-element sqrt that np.abs(psi) ** 2 performs.
+    re = psi.real
+    im = psi.imag
+    out = np.multiply(re, re, out=out)
+    out += im * im
+    return out
+
+
+def _phase_factor(theta):
+    # exp(1j * theta) from real cos/sin instead of a complex exp of an imaginary argument.
+    phase = np.empty(theta.shape, dtype=np.complex128)
+    phase.real = np.cos(theta)
+    phase.imag = np.sin(theta)
+    return phase
+
+
 def _validate_simulation_params(
     hbar, mass, grid_size, x_min, x_max, dt, steps, save_every, sigma, barrier_width, barrier_region
 ):
@@ -64,28 +100,34 @@ def _initialize_system(
     x = np.linspace(x_min, x_max, grid_size, endpoint=False)
     dx = x[1] - x[0]
     k = 2.0 * np.pi * np.fft.fftfreq(grid_size, d=dx)
+    hbar_k = hbar * k
+    hbar_k_sq = hbar_k * hbar_k
+    # Moment weights, stacked so each observation reduces a density in one pass:
+    # rows (1, x, x^2) give norm, <x>, <x^2>; rows (hbar k, (hbar k)^2) give <p>, <p^2>.
+    x_weights = np.vstack((np.ones_like(x), x, x * x))
+    p_weights = np.vstack((hbar_k, hbar_k_sq))
 
     V = barrier_height * np.exp(-(x / barrier_width) ** 2)
     psi = np.exp(-((x - x0) ** 2) / (2.0 * sigma**2)) * np.exp(1j * k0 * x)
     psi /= np.sqrt(np.sum(np.abs(psi) ** 2) * dx)
 
-    phase_v_half = np.exp(-1j * V * dt / (2.0 * hbar))
-    T_k = (hbar**2) * (k**2) / (2.0 * mass)
-    phase_t = np.exp(-1j * T_k * dt / hbar)
-    return x, dx, k, V, psi, phase_v_half, phase_t
+    phase_v_half = _phase_factor(-V * dt / (2.0 * hbar))
+    T_k = hbar_k_sq / (2.0 * mass)
+    phase_t = _phase_factor(-T_k * dt / hbar)
+    phase_v_full = phase_v_half * phase_v_half
+    return x, dx, x_weights, p_weights, V, psi, phase_v_half, phase_v_full, phase_t
 
 
-def _record_observables(psi, x, dx, k, hbar):
-    density = np.abs(psi) ** 2
-    norm = np.sum(density) * dx
+def _record_observables(psi, dx, x_weights, p_weights, density):
+    # density is a reusable output buffer for |psi|^2.
+    _density(psi, out=density)
+    norm, x_mean, x2_mean = (x_weights @ density) * dx
 
-    x_mean = np.sum(x * density) * dx
-    x2_mean = np.sum((x**2) * density) * dx
-    psi_k = np.fft.fft(psi)
-    p_psi = np.fft.ifft(hbar * k * psi_k)
-    p2_psi = np.fft.ifft((hbar * k) ** 2 * psi_k)
-    p_mean = np.real(np.sum(np.conj(psi) * p_psi) * dx)
-    p2_mean = np.real(np.sum(np.conj(psi) * p2_psi) * dx)
+    # Momentum moments straight from the spectrum (Parseval):
+    # <f(p)> = dx / N * sum(f(hbar k) |psi_k|^2), so no inverse transforms are needed.
+    psi_k = fft(psi)
+    density_k = _density(psi_k)
+    p_mean, p2_mean = (p_weights @ density_k) * (dx / psi.size)
 
     x_var = max(x2_mean - x_mean**2, 0.0)
     p_var = max(p2_mean - p_mean**2, 0.0)
@@ -94,9 +136,12 @@ def _record_observables(psi, x, dx, k, hbar):
 
 
 def _compute_diagnostics(final_density, x, dx, barrier_region, uncertainty_history):
-    reflection = np.sum(final_density[x < -barrier_region]) * dx
-    transmission = np.sum(final_density[x > barrier_region]) * dx
-    near_barrier = np.sum(final_density[np.abs(x) <= barrier_region]) * dx
+    # x is sorted, so each region is a contiguous slice rather than a boolean mask.
+    i_left = np.searchsorted(x, -barrier_region, side="left")
+    i_right = np.searchsorted(x, barrier_region, side="right")
+    reflection = np.sum(final_density[:i_left]) * dx
+    transmission = np.sum(final_density[i_right:]) * dx
+    near_barrier = np.sum(final_density[i_left:i_right]) * dx
 
     return {
         "final_norm": np.sum(final_density) * dx,
@@ -139,30 +184,38 @@ def simulate_1d_quantum_scattering(
         barrier_width,
         barrier_region,
     )
-    x, dx, k, V, psi, phase_v_half, phase_t = _initialize_system(
+    x, dx, x_weights, p_weights, V, psi, phase_v_half, phase_v_full, phase_t = _initialize_system(
         hbar, mass, grid_size, x_min, x_max, dt, barrier_height, barrier_width, x0, sigma, k0
     )
 
-    snapshots = []
-    times = []
-    norm_history = []
-    x_mean_history = []
-    p_mean_history = []
-    uncertainty_history = []
-
-    for n in range(steps + 1):
-        if n % save_every == 0:
-            density, norm, x_mean, p_mean, uncertainty = _record_observables(psi, x, dx, k, hbar)
-            snapshots.append(density.copy())
-            times.append(n * dt)
-            norm_history.append(norm)
-            x_mean_history.append(x_mean)
-            p_mean_history.append(p_mean)
-            uncertainty_history.append(uncertainty)
-
-        psi = split_operator_step(psi, phase_v_half, phase_t)
-
-    final_density = np.abs(psi) ** 2
+    # One row/entry per observation, filled in place. Snapshots are only plotted,
+    # so single precision is enough and halves their footprint.
+    n_snapshots = steps // save_every + 1
+    snapshots = np.empty((n_snapshots, grid_size), dtype=np.float32)
+    density = np.empty(grid_size)
+    times = np.empty(n_snapshots)
+    norm_history = np.empty(n_snapshots)
+    x_mean_history = np.empty(n_snapshots)
+    p_mean_history = np.empty(n_snapshots)
+    uncertainty_history = np.empty(n_snapshots)
+
+    # Observe every save_every steps, then advance to the next observation point
+    # (steps + 1 updates in total, as with one update per n in range(steps + 1)).
+    for index, n in enumerate(range(0, steps + 1, save_every)):
+        density, norm, x_mean, p_mean, uncertainty = _record_observables(
+            psi, dx, x_weights, p_weights, density
+        )
+        snapshots[index] = density
+        times[index] = n * dt
+        norm_history[index] = norm
+        x_mean_history[index] = x_mean
+        p_mean_history[index] = p_mean
+        uncertainty_history[index] = uncertainty
+
+        n_substeps = min(save_every, steps + 1 - n)
+        psi = split_operator_steps(psi, phase_v_half, phase_v_full, phase_t, n_substeps)
+
+    final_density = _density(psi)
     diagnostics = _compute_diagnostics(final_density, x, dx, barrier_region, uncertainty_history)
 
     return {
@@ -225,8 +278,8 @@ def _plot_uncertainty_panel(ax, times, uncertainty_history, hbar):
 # %%
 def plot_density_3d(result):
     x = result["x"]
-    times = np.array(result["times"])
-    snapshots = np.array(result["snapshots"])
+    times = np.asarray(result["times"])
+    snapshots = np.asarray(result["snapshots"])
 
     X, T = np.meshgrid(x, times)
     fig = plt.figure(figsize=(10, 6))
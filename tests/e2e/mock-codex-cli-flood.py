@@ -4,60 +4,102 @@ import json
 import os
 import sys
 import time
-import uuid
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional: only speeds up event encoding
+    orjson = None
+
+# Compact and non-ASCII-preserving, so the fallback writes the same bytes as orjson.
+_JSON_ENCODE = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+_STEP_MARKER = "__STEP__"
+
+
+def _encode(payload: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    return _JSON_ENCODE(payload).encode("utf-8") + b"\n"
+
+
+def _step_template(payload: dict[str, Any], count: int = -1) -> bytes:
+    # Encode once, then turn the step marker into a %d slot; literal % is escaped first.
+    encoded = _encode(payload).replace(b"%", b"%%")
+    return encoded.replace(_STEP_MARKER.encode("ascii"), b"%d", count)
+
 
 def _emit(payload: dict[str, Any]) -> None:
-    sys.stdout.write(json.dumps(payload) + "\n")
-    sys.stdout.flush()
+    sys.stdout.buffer.write(_encode(payload))
+    sys.stdout.buffer.flush()
+
+
+def _emit_many(lines: list[bytes]) -> None:
+    sys.stdout.buffer.writelines(lines)
+    sys.stdout.buffer.flush()
+
+
+_RPC_RESULTS: dict[str, dict[str, Any]] = {
+    "initialize": {"capabilities": {}},
+    "model/list": {
+        "data": [
+            {
+                "model": "gpt-5.3-codex",
+                "displayName": "GPT-5.3 Codex",
+                "supportedReasoningEfforts": ["low", "medium", "high"],
+                "defaultReasoningEffort": "high",
+            }
+        ]
+    },
+    "shutdown": {},
+}
+_RPC_ID_MARKER = "__RPC_ID__"
+
+
+def _response_template(result: dict[str, Any]) -> bytes:
+    # Encode the static response once with a %d slot for integer request ids.
+    encoded = _encode({"jsonrpc": "2.0", "id": _RPC_ID_MARKER, "result": result}).replace(b"%", b"%%")
+    return encoded.replace(f'"{_RPC_ID_MARKER}"'.encode("ascii"), b"%d", 1)
+
+
+_RPC_RESPONSE_TEMPLATES = {method: _response_template(result) for method, result in _RPC_RESULTS.items()}
 
 
 def _run_app_server() -> int:
-    for raw_line in sys.stdin:
+    # Read raw bytes: both parsers accept them, so lines are never decoded to str first.
+    stdin = sys.stdin.buffer
+    while True:
+        raw_line = stdin.readline()
+        if not raw_line:
+            break
         line = raw_line.strip()
         if not line:
             continue
         try:
-            req = json.loads(line)
-        except json.JSONDecodeError:
+            req = orjson.loads(line) if orjson is not None else json.loads(line)
+        except ValueError:  # JSONDecodeError from either parser, or invalid UTF-8
             continue
 
         req_id = req.get("id")
         method = req.get("method")
-        if method == "initialize" and req_id is not None:
-            _emit({"jsonrpc": "2.0", "id": req_id, "result": {"capabilities": {}}})
-            continue
-        if method == "model/list" and req_id is not None:
-            _emit(
-                {
-                    "jsonrpc": "2.0",
-                    "id": req_id,
-                    "result": {
-                        "data": [
-                            {
-                                "model": "gpt-5.3-codex",
-                                "displayName": "GPT-5.3 Codex",
-                                "supportedReasoningEfforts": ["low", "medium", "high"],
-                                "defaultReasoningEffort": "high",
-                            }
-                        ]
-                    },
-                }
-            )
-            continue
-        if method == "shutdown" and req_id is not None:
-            _emit({"jsonrpc": "2.0", "id": req_id, "result": {}})
+        template = _RPC_RESPONSE_TEMPLATES.get(method)
+        if template is None or req_id is None:
             continue
+        if type(req_id) is int:
+            sys.stdout.buffer.write(template % req_id)
+            sys.stdout.buffer.flush()
+        else:
+            _emit({"jsonrpc": "2.0", "id": req_id, "result": _RPC_RESULTS[method]})
 
     return 0
 
 
 def _int_env(name: str, default: int, minimum: int) -> int:
-    raw = os.environ.get(name, str(default)).strip()
-    try:
+    raw = os.environ.get(name, "").strip()
+    # isdecimal() (unlike isdigit()) only admits characters int() can parse, so no try/except.
+    if raw.isdecimal() or (raw[:1] == "-" and raw[1:].isdecimal()):
         value = int(raw)
-    except ValueError:
+    else:
         value = default
     return max(minimum, value)
 
@@ -66,6 +108,7 @@ def _run_exec_mode() -> int:
     event_count = _int_env("MOCK_CODEX_EVENT_COUNT", 320, 20)
     event_delay_ms = _int_env("MOCK_CODEX_EVENT_DELAY_MS", 20, 0)
     chunk_words = _int_env("MOCK_CODEX_CHUNK_WORDS", 14, 4)
+    sleep_batch = _int_env("MOCK_CODEX_SLEEP_BATCH", 1, 1)
 
     exit_code_raw = os.environ.get("MOCK_CODEX_EXIT_CODE", "0").strip()
     try:
@@ -76,41 +119,67 @@ def _run_exec_mode() -> int:
     prompt = sys.stdin.read().strip()
     prompt_preview = prompt[:120] if prompt else "(empty prompt)"
     repeated = " ".join(["analysis"] * chunk_words)
-    thread_id = f"mock-thread-{uuid.uuid4().hex[:12]}"
-
-    _emit({"type": "thread.started", "thread_id": thread_id})
-    _emit({"type": "item.started", "item": {"type": "reasoning", "title": "Long reasoning started"}})
-
+    body_suffix = f"{prompt_preview} :: {repeated}"
+    thread_id = f"mock-thread-{os.urandom(6).hex()}"
+
+    _emit_many(
+        [
+            _encode({"type": "thread.started", "thread_id": thread_id}),
+            _encode({"type": "item.started", "item": {"type": "reasoning", "title": "Long reasoning started"}}),
+        ]
+    )
+
+    # Only the step number changes between iterations, so each event is encoded once
+    # up front. The agent message marker is replaced once: it precedes the prompt text.
+    message_template = _step_template(
+        {
+            "type": "item.completed",
+            "item": {
+                "type": "agent_message",
+                "text": f"[{_STEP_MARKER}/{event_count}] {body_suffix}",
+            },
+        },
+        count=1,
+    )
+    command_started_template = _step_template(
+        {
+            "type": "item.started",
+            "item": {
+                "type": "command",
+                "title": f"Tool step {_STEP_MARKER} started",
+                "command": f"python -m check {_STEP_MARKER}",
+            },
+        }
+    )
+    command_completed_template = _step_template(
+        {
+            "type": "item.completed",
+            "item": {
+                "type": "command",
+                "title": f"Tool step {_STEP_MARKER} completed",
+                "command": f"python -m check {_STEP_MARKER}",
+                "exit_code": 0,
+            },
+        }
+    )
+
+    # With a delay, steps are streamed in groups of MOCK_CODEX_SLEEP_BATCH (default 1)
+    # followed by one sleep covering the whole group, so the total pacing is unchanged.
+    # Without one (stress runs) the events are flushed in batches so syscalls don't dominate.
+    batch_size = sleep_batch if event_delay_ms > 0 else 16
+    pending: list[bytes] = []
+    batch_start = 0
     for idx in range(event_count):
         step = idx + 1
-        _emit(
-            {
-                "type": "item.completed",
-                "item": {
-                    "type": "agent_message",
-                    "text": f"[{step}/{event_count}] {prompt_preview} :: {repeated}",
-                },
-            }
-        )
-        _emit(
-            {
-                "type": "item.started",
-                "item": {"type": "command", "title": f"Tool step {step} started", "command": f"python -m check {step}"},
-            }
-        )
-        _emit(
-            {
-                "type": "item.completed",
-                "item": {
-                    "type": "command",
-                    "title": f"Tool step {step} completed",
-                    "command": f"python -m check {step}",
-                    "exit_code": 0,
-                },
-            }
-        )
-        if event_delay_ms > 0:
-            time.sleep(event_delay_ms / 1000.0)
+        pending.append(message_template % step)
+        pending.append(command_started_template % (step, step))
+        pending.append(command_completed_template % (step, step))
+        if step % batch_size == 0 or step == event_count:
+            _emit_many(pending)
+            pending.clear()
+            if event_delay_ms > 0:
+                time.sleep(event_delay_ms * (step - batch_start) / 1000.0)
+            batch_start = step
 
     _emit({"type": "item.completed", "item": {"type": "reasoning", "title": "Long reasoning completed"}})
     return exit_code
@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 
 import json
+import os
 import sys
-import uuid
 from typing import Any
 
 
 def _emit(payload: dict[str, Any]) -> None:
-    sys.stdout.write(json.dumps(payload) + "\n")
-    sys.stdout.flush()
+    # json.dumps escapes everything outside ASCII, so the bytes can skip the text layer.
+    sys.stdout.buffer.write(json.dumps(payload).encode("ascii") + b"\n")
+    sys.stdout.buffer.flush()
 
 
 def _run_app_server() -> int:
@@ -53,7 +54,7 @@ def _run_app_server() -> int:
 
 def _run_exec_mode() -> int:
     prompt = sys.stdin.read()
-    thread_id = f"mock-thread-{uuid.uuid4().hex[:12]}"
+    thread_id = f"mock-thread-{os.urandom(6).hex()}"
     head = prompt[:800]
     tail = prompt[-800:] if prompt else ""
 
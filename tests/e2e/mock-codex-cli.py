@@ -4,51 +4,79 @@ import json
 import os
 import sys
 import time
-import uuid
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional: only speeds up event encoding
+    orjson = None
+
+# Compact and non-ASCII-preserving, so the fallback writes the same bytes as orjson.
+_JSON_ENCODE = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def _encode(payload: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    return _JSON_ENCODE(payload).encode("utf-8") + b"\n"
+
 
 def _emit(payload: dict[str, Any]) -> None:
-    sys.stdout.write(json.dumps(payload) + "\n")
-    sys.stdout.flush()
+    sys.stdout.buffer.write(_encode(payload))
+    sys.stdout.buffer.flush()
+
+
+_RPC_RESULTS: dict[str, dict[str, Any]] = {
+    "initialize": {"capabilities": {}},
+    "model/list": {
+        "data": [
+            {
+                "model": "mock-gpt",
+                "displayName": "Mock GPT",
+                "supportedReasoningEfforts": ["low", "medium", "high"],
+                "defaultReasoningEffort": "medium",
+            }
+        ]
+    },
+    "shutdown": {},
+}
+_RPC_ID_MARKER = "__RPC_ID__"
+
+
+def _response_template(result: dict[str, Any]) -> bytes:
+    # Encode the static response once with a %d slot for integer request ids.
+    encoded = _encode({"jsonrpc": "2.0", "id": _RPC_ID_MARKER, "result": result}).replace(b"%", b"%%")
+    return encoded.replace(f'"{_RPC_ID_MARKER}"'.encode("ascii"), b"%d", 1)
+
+
+_RPC_RESPONSE_TEMPLATES = {method: _response_template(result) for method, result in _RPC_RESULTS.items()}
 
 
 def _run_app_server() -> int:
-    for raw_line in sys.stdin:
+    # Read raw bytes: both parsers accept them, so lines are never decoded to str first.
+    stdin = sys.stdin.buffer
+    while True:
+        raw_line = stdin.readline()
+        if not raw_line:
+            break
         line = raw_line.strip()
         if not line:
             continue
         try:
-            req = json.loads(line)
-        except json.JSONDecodeError:
+            req = orjson.loads(line) if orjson is not None else json.loads(line)
+        except ValueError:  # JSONDecodeError from either parser, or invalid UTF-8
             continue
 
         req_id = req.get("id")
         method = req.get("method")
-        if method == "initialize" and req_id is not None:
-            _emit({"jsonrpc": "2.0", "id": req_id, "result": {"capabilities": {}}})
-            continue
-        if method == "model/list" and req_id is not None:
-            _emit(
-                {
-                    "jsonrpc": "2.0",
-                    "id": req_id,
-                    "result": {
-                        "data": [
-                            {
-                                "model": "mock-gpt",
-                                "displayName": "Mock GPT",
-                                "supportedReasoningEfforts": ["low", "medium", "high"],
-                                "defaultReasoningEffort": "medium",
-                            }
-                        ]
-                    },
-                }
-            )
-            continue
-        if method == "shutdown" and req_id is not None:
-            _emit({"jsonrpc": "2.0", "id": req_id, "result": {}})
+        template = _RPC_RESPONSE_TEMPLATES.get(method)
+        if template is None or req_id is None:
             continue
+        if type(req_id) is int:
+            sys.stdout.buffer.write(template % req_id)
+            sys.stdout.buffer.flush()
+        else:
+            _emit({"jsonrpc": "2.0", "id": req_id, "result": _RPC_RESULTS[method]})
 
     return 0
 
@@ -66,7 +94,7 @@ def _run_exec_mode() -> int:
         exit_code = 0
 
     prompt = sys.stdin.read().strip()
-    thread_id = f"mock-thread-{uuid.uuid4().hex[:12]}"
+    thread_id = f"mock-thread-{os.urandom(6).hex()}"
 
     _emit({"type": "thread.started", "thread_id": thread_id})
     _emit({"type": "item.started", "item": {"type": "reasoning", "title": "Mock run started"}})
@@ -10,6 +10,8 @@ _SAFE_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
 
 
 class _DummySessionStore:
+    __slots__ = ("resolved_session_id", "ensure_calls")
+
     def __init__(self, resolved_session_id: str = ""):
         self.resolved_session_id = resolved_session_id
         self.ensure_calls: list[tuple[str, str, str]] = []
@@ -45,30 +47,39 @@ class TestSessionIdCoercion(unittest.TestCase):
         self.assertEqual(_coerce_session_id("thread_01-alpha"), "thread_01-alpha")
 
     def test_coerce_session_id_rejects_path_elements(self):
-        self.assertEqual(_coerce_session_id("../thread-1"), "")
-        self.assertEqual(_coerce_session_id("..\\thread-1"), "")
-        self.assertEqual(_coerce_session_id("thread/../1"), "")
-        self.assertEqual(_coerce_session_id("thread.1"), "")
+        for value in ("../thread-1", "..\\thread-1", "thread/../1", "thread.1"):
+            with self.subTest(value=value):
+                self.assertEqual(_coerce_session_id(value), "")
 
     def test_coerce_session_id_rejects_non_string(self):
-        self.assertEqual(_coerce_session_id(None), "")
-        self.assertEqual(_coerce_session_id(123), "")
+        for value in (None, 123):
+            with self.subTest(value=value):
+                self.assertEqual(_coerce_session_id(value), "")
+
+
+def _send_model_catalog_stub(*args, **kwargs) -> None:
+    return None
+
+
+def _resolve_notebook_os_path_stub(path: str) -> str:
+    return ""
 
 
 class TestHandleStartSessionSessionId(unittest.IsolatedAsyncioTestCase):
-    def _make_handler(self, resolved_session_id: str) -> CodexWSHandler:
+    def setUp(self):
         handler = CodexWSHandler.__new__(CodexWSHandler)
-        handler._store = _DummySessionStore(resolved_session_id=resolved_session_id)
+        handler._store = _DummySessionStore()
         handler._runner = None
         handler._active_runs = {}
         handler._messages: list[str] = []
         handler._safe_write_message = handler._messages.append
-        handler._send_model_catalog = lambda *args, **kwargs: None
-        handler._resolve_notebook_os_path = lambda path: ""
-        return handler
+        handler._send_model_catalog = _send_model_catalog_stub
+        handler._resolve_notebook_os_path = _resolve_notebook_os_path_stub
+        self.handler = handler
 
     async def test_start_session_uses_sanitized_mapped_session_id_for_invalid_payload_id(self):
-        handler = self._make_handler(resolved_session_id="mapped_thread")
+        handler = self.handler
+        handler._store.resolved_session_id = "mapped_thread"
 
         payload = {
             "sessionId": "../evil/session",
@@ -90,7 +101,8 @@ class TestHandleStartSessionSessionId(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(handler._store.ensure_calls[0][0], "mapped_thread")
 
     async def test_start_session_falls_back_to_generated_safe_session_id(self):
-        handler = self._make_handler(resolved_session_id="../unsafe/mapped")
+        handler = self.handler
+        handler._store.resolved_session_id = "../unsafe/mapped"
 
         payload = {
             "sessionId": "../../payload",
@@ -81,89 +81,62 @@ class TestProtocolBuilders(unittest.TestCase):
         with self.assertRaises(ProtocolParseError):
             parse_client_message({"type": "unknown"})
 
-    def test_builders_shape(self):
-        self.assertEqual(
-            build_status_payload(
-                state="ready",
-                run_id="run-1",
-                session_id="thread-1",
-                session_context_key="ctx-1",
-                notebook_path="/notebooks/a.ipynb",
-                run_mode="resume",
-                paired_ok=True,
-                paired_path="/paired",
-                paired_os_path="/paired-os",
-                paired_message="paired",
-                notebook_mode="ipynb",
-                history=[{"role": "user", "content": "hi"}],
-            )["type"],
-            "status",
-        )
-
-        output = build_output_payload(
-            run_id="run-1",
-            session_id="thread-1",
-            session_context_key="ctx-1",
-            notebook_path="/notebooks/a.ipynb",
-            text="ok",
-            role="system",
-        )
-        self.assertEqual(output["role"], "system")
-
-        event = build_event_payload(
-            run_id="run-1",
-            session_id="thread-1",
-            session_context_key="ctx-1",
-            notebook_path="/notebooks/a.ipynb",
-            payload={"kind": "log"},
-        )
-        self.assertEqual(event["payload"], {"kind": "log"})
-
-        done = build_done_payload(
-            run_id="run-1",
-            session_id="thread-1",
-            session_context_key="ctx-1",
-            notebook_path="/notebooks/a.ipynb",
-            exit_code=0,
-            file_changed=False,
-            run_mode="resume",
-            paired_ok=True,
-            paired_path="/paired",
-            paired_os_path="/paired-os",
-            paired_message="paired",
-            notebook_mode="ipynb",
-            cancelled=True,
-        )
-        self.assertTrue(done["cancelled"])
+    _COMMON = {
+        "run_id": "run-1",
+        "session_id": "thread-1",
+        "session_context_key": "ctx-1",
+        "notebook_path": "/notebooks/a.ipynb",
+    }
+    _PAIRING = {
+        "run_mode": "resume",
+        "paired_ok": True,
+        "paired_path": "/paired",
+        "paired_os_path": "/paired-os",
+        "paired_message": "paired",
+        "notebook_mode": "ipynb",
+    }
 
-        error = build_error_payload(
-            message="bad",
-            run_id="run-1",
-            session_id="thread-1",
-            session_context_key="ctx-1",
-            notebook_path="/notebooks/a.ipynb",
-            run_mode="fallback",
-            suggested_command_path="/usr/bin/codex",
-            paired_ok=True,
-        )
-        self.assertEqual(error["message"], "bad")
-        self.assertEqual(error["runMode"], "fallback")
+    def test_builders_shape(self):
+        cases = [
+            (
+                build_status_payload,
+                {**self._COMMON, **self._PAIRING, "state": "ready", "history": [{"role": "user", "content": "hi"}]},
+                {"type": "status"},
+            ),
+            (build_output_payload, {**self._COMMON, "text": "ok", "role": "system"}, {"role": "system"}),
+            (build_event_payload, {**self._COMMON, "payload": {"kind": "log"}}, {"payload": {"kind": "log"}}),
+            (
+                build_done_payload,
+                {**self._COMMON, **self._PAIRING, "exit_code": 0, "file_changed": False, "cancelled": True},
+                {"cancelled": True},
+            ),
+            (
+                build_error_payload,
+                {
+                    **self._COMMON,
+                    "message": "bad",
+                    "run_mode": "fallback",
+                    "suggested_command_path": "/usr/bin/codex",
+                    "paired_ok": True,
+                },
+                {"message": "bad", "runMode": "fallback"},
+            ),
+            (
+                build_delete_all_payload,
+                {"ok": True, "deleted_count": 1, "failed_count": 0, "message": "deleted"},
+                {"ok": True, "message": "deleted"},
+            ),
+            (build_cli_defaults_payload, {"model": "o4-mini", "reasoning_effort": "low"}, {"model": "o4-mini"}),
+        ]
+        for builder, kwargs, expected in cases:
+            with self.subTest(builder=builder.__name__):
+                payload = builder(**kwargs)
+                for key, value in expected.items():
+                    self.assertEqual(payload[key], value)
 
         rates = build_rate_limits_payload({"x": 1})
         self.assertEqual(rates["snapshot"], {"x": 1})
 
-        delete_all = build_delete_all_payload(
-            ok=True,
-            deleted_count=1,
-            failed_count=0,
-            message="deleted",
-        )
-        self.assertTrue(delete_all["ok"])
-        self.assertEqual(delete_all["message"], "deleted")
-
-        defaults = build_cli_defaults_payload(model="o4-mini", reasoning_effort="low")
-        self.assertEqual(defaults["model"], "o4-mini")
-
 
 if __name__ == "__main__":
     unittest.main()
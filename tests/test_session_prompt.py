@@ -0,0 +1,21 @@
+import tempfile
+import unittest
+
+from jupyterlab_codex.sessions import SessionStore
+
+
+class TestBuildPromptHistory(unittest.TestCase):
+    def test_non_string_content_is_rendered_like_fstring(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            store = SessionStore(base_dir=base_dir)
+            session_id = "session-odd-content"
+            store.ensure_session(session_id, "a.ipynb")
+            store._jsonl_path(session_id).write_text(
+                '{"role": "user", "content": null}\n'
+                '{"role": "assistant", "content": ["a", 1]}\n',
+                encoding="utf-8",
+            )
+
+            prompt = store.build_prompt(session_id, "next", "", "")
+
+            self.assertIn("Conversation:\nUser: None\nAssistant: ['a', 1]\n", prompt)
@@ -0,0 +1,35 @@
+import unittest
+
+from jupyterlab_codex.sessions import _sanitize_sensitive_values
+
+
+class TestSanitizeSensitiveValues(unittest.TestCase):
+    def test_redacts_keyword_assignments_case_insensitively(self):
+        self.assertEqual(_sanitize_sensitive_values("api_key=abc123"), "api_key=[REDACTED]")
+        self.assertEqual(_sanitize_sensitive_values("PASSWORD: hunter2"), "PASSWORD: [REDACTED]")
+        self.assertEqual(
+            _sanitize_sensitive_values("Access-Token = t0k, next"), "Access-Token = [REDACTED], next"
+        )
+
+    def test_redacts_prefixed_and_jwt_tokens(self):
+        self.assertEqual(_sanitize_sensitive_values("use SK_live_abc now"), "use [REDACTED_TOKEN] now")
+        self.assertEqual(_sanitize_sensitive_values("ghp" + "A" * 24), "[REDACTED_TOKEN]")
+        self.assertEqual(_sanitize_sensitive_values("t=eyJa.eyJb.sig"), "t=[REDACTED_TOKEN]")
+
+    def test_jwt_ending_in_keyword_redacts_token_and_value(self):
+        self.assertEqual(
+            _sanitize_sensitive_values("eyJa.b.secret=val"), "[REDACTED_TOKEN]=[REDACTED]"
+        )
+
+    def test_unicode_case_folds_of_keywords_and_prefixes_are_redacted(self):
+        # Kelvin sign, long s and dotted capital I fold onto k, s and i.
+        self.assertEqual(_sanitize_sensitive_values("api_\u212aey=abc"), "api_\u212aey=[REDACTED]")
+        self.assertEqual(_sanitize_sensitive_values("\u017fecret: x"), "\u017fecret: [REDACTED]")
+        self.assertEqual(
+            _sanitize_sensitive_values("author\u0130zation=zz"), "author\u0130zation=[REDACTED]"
+        )
+        self.assertEqual(_sanitize_sensitive_values("\u017fk_live_abc"), "[REDACTED_TOKEN]")
+
+    def test_plain_text_is_unchanged(self):
+        text = "import numpy as np\nprint(np.arange(3))"
+        self.assertEqual(_sanitize_sensitive_values(text), text)
@@ -0,0 +1,52 @@
+import json
+import tempfile
+import unittest
+
+from jupyterlab_codex.sessions import SessionStore
+
+
+class TestSessionStoreMessageCache(unittest.TestCase):
+    def test_load_messages_tracks_appends_and_trimming(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            store = SessionStore(base_dir=base_dir)
+            session_id = "session-cache"
+            store.ensure_session(session_id, "a.ipynb")
+            store.append_message(session_id, "user", "first")
+            self.assertEqual([m["content"] for m in store.load_messages(session_id)], ["first"])
+
+            for index in range(120):
+                store.append_message(session_id, "assistant", f"reply-{index}")
+
+            cached = store.load_messages(session_id)
+            fresh = SessionStore(base_dir=base_dir).load_messages(session_id)
+            self.assertEqual(cached, fresh)
+            self.assertEqual(len(cached), 100)
+            self.assertEqual(cached[-1]["content"], "reply-119")
+
+    def test_load_messages_rereads_file_changed_outside_the_store(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            store = SessionStore(base_dir=base_dir)
+            session_id = "session-external"
+            store.append_message(session_id, "user", "hello")
+            store.load_messages(session_id)
+
+            with open(store._jsonl_path(session_id), "a", encoding="utf-8") as handle:
+                handle.write(json.dumps({"role": "assistant", "content": "written elsewhere"}))
+                handle.write("\n")
+
+            messages = store.load_messages(session_id)
+            self.assertEqual([m["content"] for m in messages], ["hello", "written elsewhere"])
+
+    def test_delete_and_rename_drop_cached_history(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            store = SessionStore(base_dir=base_dir)
+            store.ensure_session("old-id", "a.ipynb")
+            store.append_message("old-id", "user", "hello")
+            store.load_messages("old-id")
+
+            store.rename_session("old-id", "new-id")
+            self.assertEqual(store.load_messages("old-id"), [])
+            self.assertEqual([m["content"] for m in store.load_messages("new-id")], ["hello"])
+
+            store.delete_session("new-id")
+            self.assertEqual(store.load_messages("new-id"), [])
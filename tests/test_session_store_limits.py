@@ -27,6 +27,26 @@ class TestSessionStoreMessageLimits(unittest.TestCase):
             else:
                 os.environ["JUPYTERLAB_CODEX_SESSION_MAX_MESSAGES"] = previous
 
+    def test_append_messages_trims_to_default_max_of_100(self):
+        previous = os.environ.pop("JUPYTERLAB_CODEX_SESSION_MAX_MESSAGES", None)
+        try:
+            with tempfile.TemporaryDirectory() as base_dir:
+                store = SessionStore(base_dir=base_dir)
+                session_id = "session-batch-default-limit"
+
+                store.append_messages(session_id, "user", (f"message-{index}" for index in range(150)))
+
+                messages = store.load_messages(session_id)
+
+                self.assertEqual(len(messages), 100)
+                self.assertEqual(messages[0]["content"], "message-50")
+                self.assertEqual(messages[-1]["content"], "message-149")
+        finally:
+            if previous is None:
+                os.environ.pop("JUPYTERLAB_CODEX_SESSION_MAX_MESSAGES", None)
+            else:
+                os.environ["JUPYTERLAB_CODEX_SESSION_MAX_MESSAGES"] = previous
+
     def test_custom_max_environment_variable_is_respected(self):
         previous = os.environ.get("JUPYTERLAB_CODEX_SESSION_MAX_MESSAGES")
         try:
@@ -48,3 +68,18 @@ class TestSessionStoreMessageLimits(unittest.TestCase):
                 os.environ.pop("JUPYTERLAB_CODEX_SESSION_MAX_MESSAGES", None)
             else:
                 os.environ["JUPYTERLAB_CODEX_SESSION_MAX_MESSAGES"] = previous
+
+
+class TestSessionStoreCorruptRecords(unittest.TestCase):
+    def test_load_messages_skips_blank_invalid_and_non_utf8_lines(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            store = SessionStore(base_dir=base_dir)
+            session_id = "session-corrupt"
+            store._jsonl_path(session_id).write_bytes(
+                b'{"role": "user", "content": "a"}\n\n  \nnot json\n[1]\n'
+                b'{"role": "user", "content": "\xff"}\n{"role": "assistant", "content": "b"}\r\n'
+            )
+
+            messages = store.load_messages(session_id)
+
+            self.assertEqual([m["content"] for m in messages], ["a", "b"])
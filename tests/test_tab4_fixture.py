@@ -0,0 +1,35 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+_TAB4_PATH = Path(__file__).parent / "e2e" / "fixtures" / "notebooks" / "tab4.py"
+
+
+def _load_tab4():
+    spec = importlib.util.spec_from_file_location("tab4_fixture", _TAB4_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestTab4EigenSolvers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tab4 = _load_tab4()
+
+    def test_zero_states_returns_empty_arrays(self):
+        for solver in (self.tab4.solve_harmonic_oscillator, self.tab4.solve_finite_square_well):
+            with self.subTest(solver=solver.__name__):
+                result = solver(n_states=0)
+                self.assertEqual(result["energies"].shape, (0,))
+                self.assertEqual(result["states"].shape, (result["x"].size, 0))
+
+    def test_tunneling_result_arrays_are_writable_copies(self):
+        first = self.tab4.run_quantum_tunneling_simulation(n_steps=20, snapshot_every=10)
+        first["x"][0] = 1e9
+        first["V"][:] = 0.0
+
+        second = self.tab4.run_quantum_tunneling_simulation(n_steps=20, snapshot_every=10)
+
+        self.assertNotEqual(second["x"][0], 1e9)
+        self.assertGreater(second["V"].max(), 0.0)